@@ -1,82 +1,348 @@
+from collections import OrderedDict, deque
+from contextlib import aclosing
 from pathlib import Path
-from openai import OpenAI
+from openai import NOT_GIVEN, AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
 from dotenv import load_dotenv
+import array
+import asyncio
+import atexit
+import hashlib
+import httpx
+import importlib.util
+import math
 import os
+import queue
+import re
+import struct
+import sys
+import threading
 import time
 import pyaudio
-import wave
-import keyboard
 import pygame
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Get OpenAI API key from environment variables
+# Get OpenAI API key from environment variables, failing fast if it is missing
 openai_api_key = os.getenv("OPENAI_API_KEY")
+if not openai_api_key:
+    raise SystemExit("OPENAI_API_KEY not found in environment variables")
 
-def initialize_openai_client():
-    """Initialize and return the OpenAI client."""
-    if not openai_api_key:
-        raise ValueError("OPENAI_API_KEY not found in environment variables")
-    return OpenAI()
+# One pool serves chat, speech and transcription, including the parallel
+# per-sentence speech requests. Idle connections are kept long enough to
+# survive the pause between turns.
+HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=300.0)
+# Keep the SDK's short connect timeout so an unreachable API fails fast
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+# HTTP/2 needs the optional "h2" package (pip install "httpx[http2]"); with it, all
+# requests are multiplexed over a single connection to the API
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Shared OpenAI clients, reused for every request. The SDK's default transports
+# keep its other settings, such as following redirects.
+CLIENT = OpenAI(
+    api_key=openai_api_key,
+    timeout=HTTP_TIMEOUT,
+    http_client=DefaultHttpxClient(limits=HTTP_LIMITS, http2=HTTP2_AVAILABLE)
+)
+ASYNC_CLIENT = AsyncOpenAI(
+    api_key=openai_api_key,
+    timeout=HTTP_TIMEOUT,
+    http_client=DefaultAsyncHttpxClient(limits=HTTP_LIMITS, http2=HTTP2_AVAILABLE)
+)
+
+async def warm_up_connection_async():
+    """
+    Open a pooled connection on the async client ahead of time, so the next
+    request does not pay for the TCP and TLS handshakes.
+    """
+    try:
+        await ASYNC_CLIENT.models.list()
+    except Exception:
+        # Warming up is best effort; the real requests will surface any problem
+        pass
+
+# Conversation history is summarized once it grows past this many estimated tokens,
+# or before the next turn would push the oldest messages out of the bounded history
+HISTORY_TOKEN_BUDGET = 3000
+HISTORY_MAX_TURNS = 20
+HISTORY_KEEP_MESSAGES = 6
+
+# Whitespace following sentence-ending punctuation
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+# Directory containing this script, where audio files are stored
+_SCRIPT_DIR = Path(__file__).resolve().parent
 
 def get_speech_file_path(filename="speech.mp3"):
     """Get the path for the speech file in the same directory as the script."""
-    return Path(__file__).parent / filename
+    return _SCRIPT_DIR / filename
+
+# Audio recording parameters
+CHUNK = 1024
+FORMAT = pyaudio.paInt16
+SAMPLE_WIDTH = pyaudio.get_sample_size(FORMAT)
+CHANNELS = 1
+# Speech recognition gains nothing above 16 kHz, and the upload is a third of 44.1 kHz
+RATE = 16000
+
+# Voice activity detection: frames quieter than the threshold count as silence
+VAD_FRAME_MS = 20
+SPEECH_RMS_THRESHOLD = 500
+END_OF_SPEECH_MS = 600
+PRE_ROLL_FRAMES = 10
+
+# Shared PortAudio instance, created on first recording and reused afterwards
+_pyaudio = None
 
-def record_audio(filename="input.wav", duration=5):
+def get_pyaudio():
+    """Return the shared PyAudio instance, initializing PortAudio on first use."""
+    global _pyaudio
+    if _pyaudio is None:
+        _pyaudio = pyaudio.PyAudio()
+        atexit.register(_pyaudio.terminate)
+    return _pyaudio
+
+def wav_header(data_size):
     """
-    Record audio from the microphone and save it to a file.
+    Build the 44-byte RIFF header for PCM audio in the recording format.
     
     Args:
-        filename (str): Name of the output file
-        duration (int): Recording duration in seconds
+        data_size (int): Size of the PCM data in bytes
     
     Returns:
-        str: Path to the recorded audio file
+        bytes: The WAV header
     """
-    # Audio recording parameters
-    CHUNK = 1024
-    FORMAT = pyaudio.paInt16
-    CHANNELS = 1
-    RATE = 44100
+    block_align = CHANNELS * SAMPLE_WIDTH
+    return struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', 36 + data_size, b'WAVE',
+        b'fmt ', 16, 1, CHANNELS, RATE, RATE * block_align, block_align, SAMPLE_WIDTH * 8,
+        b'data', data_size
+    )
+
+def encode_wav(pcm):
+    """
+    Wrap PCM audio in a WAV container.
     
-    p = pyaudio.PyAudio()
+    Args:
+        pcm (bytes): The PCM audio data
     
-    # Open stream
-    stream = p.open(format=FORMAT,
-                    channels=CHANNELS,
-                    rate=RATE,
-                    input=True,
-                    frames_per_buffer=CHUNK)
+    Returns:
+        bytes: The complete WAV file contents
+    """
+    return wav_header(len(pcm)) + pcm
+
+def write_wav(file_path, wav_data):
+    """
+    Write WAV file contents to disk with a single write call.
     
-    print(f"Recording for {duration} seconds...")
-    frames = []
+    Args:
+        file_path (Path): The file to write
+        wav_data (bytes): The complete WAV file contents
+    """
+    data = memoryview(wav_data)
+    fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        # os.write may write less than asked, so keep going until done
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+
+def is_speech(frame):
+    """
+    Decide whether a frame of 16-bit audio contains speech, based on its loudness.
     
-    # Record for the specified duration
-    for i in range(0, int(RATE / CHUNK * duration)):
-        data = stream.read(CHUNK)
-        frames.append(data)
+    Args:
+        frame (bytes): One frame of PCM audio
+    
+    Returns:
+        bool: True if the frame is loud enough to be speech
+    """
+    samples = array.array('h', frame)
+    if not samples:
+        return False
+    rms = math.sqrt(sum(sample * sample for sample in samples) / len(samples))
+    return rms >= SPEECH_RMS_THRESHOLD
+
+def capture_audio(duration=15, wait_timeout=5):
+    """
+    Record a spoken utterance from the microphone and keep it in memory.
+    
+    Recording starts at the first frame that contains speech and stops once
+    the speaker has been silent for END_OF_SPEECH_MS, or after duration
+    seconds, whichever comes first.
+    
+    Args:
+        duration (int): Maximum recording duration in seconds
+        wait_timeout (int): How long to wait for speech to start, in seconds
+    
+    Returns:
+        bytes: The recording as WAV file contents, or None if no speech was heard
+    """
+    # Open stream
+    stream = get_pyaudio().open(format=FORMAT,
+                                channels=CHANNELS,
+                                rate=RATE,
+                                input=True,
+                                frames_per_buffer=CHUNK)
+    
+    print("Listening... start speaking.")
+    
+    # Read straight into a buffer with room for the longest allowed recording
+    samples_per_frame = RATE * VAD_FRAME_MS // 1000
+    frame_bytes = samples_per_frame * CHANNELS * SAMPLE_WIDTH
+    max_frames = int(duration * 1000 / VAD_FRAME_MS)
+    max_bytes = max_frames * frame_bytes
+    buffer = bytearray((max_frames + PRE_ROLL_FRAMES) * frame_bytes)
+    view = memoryview(buffer)
+    offset = 0
+    
+    # Keep the frames just before speech starts so the first syllable is not cut off
+    pre_roll = deque(maxlen=PRE_ROLL_FRAMES)
+    waited_frames = 0
+    speaking = False
+    silent_frames = 0
+    end_of_speech_frames = END_OF_SPEECH_MS // VAD_FRAME_MS
+    
+    # The PyAudio instance is shared, so the stream must be closed on every path
+    try:
+        while True:
+            frame = stream.read(samples_per_frame, exception_on_overflow=False)
+            voiced = is_speech(frame)
+            
+            if not speaking:
+                if not voiced:
+                    pre_roll.append(frame)
+                    waited_frames += 1
+                    if waited_frames * VAD_FRAME_MS >= wait_timeout * 1000:
+                        break
+                    continue
+                speaking = True
+                for earlier in pre_roll:
+                    view[offset:offset + len(earlier)] = earlier
+                    offset += len(earlier)
+            
+            view[offset:offset + len(frame)] = frame
+            offset += len(frame)
+            
+            # Stop at the end of the utterance or once duration seconds, including
+            # the pre-roll, have been captured
+            silent_frames = 0 if voiced else silent_frames + 1
+            if silent_frames >= end_of_speech_frames or offset >= max_bytes:
+                break
+    finally:
+        stream.stop_stream()
+        stream.close()
     
     print("Recording finished")
     
-    # Stop and close the stream
-    stream.stop_stream()
-    stream.close()
-    p.terminate()
+    if not speaking:
+        return None
+    
+    return encode_wav(view[:offset])
+
+def record_audio(filename="input.wav", duration=15):
+    """
+    Record a spoken utterance from the microphone and save it to a file.
+    
+    Args:
+        filename (str): Name of the output file
+        duration (int): Maximum recording duration in seconds
+    
+    Returns:
+        str: Path to the recorded audio file, or None if no speech was heard
+    """
+    wav_data = capture_audio(duration)
+    if wav_data is None:
+        return None
     
-    # Save the recorded data
     output_path = get_speech_file_path(filename)
-    wf = wave.open(str(output_path), 'wb')
-    wf.setnchannels(CHANNELS)
-    wf.setsampwidth(p.get_sample_size(FORMAT))
-    wf.setframerate(RATE)
-    wf.writeframes(b''.join(frames))
-    wf.close()
+    write_wav(output_path, wav_data)
     
     return str(output_path)
 
-def text_to_speech(text, voice="coral", instructions=None, output_file="speech.mp3"):
+TTS_MODEL = "gpt-4o-mini-tts"
+
+# Recently generated speech, keyed by everything that affects the audio
+SPEECH_CACHE_SIZE = 256
+_speech_cache = OrderedDict()
+
+def speech_cache_key(text, voice, instructions, model=TTS_MODEL, audio_format="mp3"):
+    """Return the cache key for a text-to-speech request."""
+    key = repr((text, voice, model, instructions, audio_format)).encode("utf-8")
+    return hashlib.blake2b(key, digest_size=16).hexdigest()
+
+def get_cached_speech(key):
+    """Return the cached audio for a key, or None if it is not cached."""
+    audio = _speech_cache.get(key)
+    if audio is not None:
+        _speech_cache.move_to_end(key)
+    return audio
+
+def cache_speech(key, audio):
+    """Store generated audio, evicting the least recently used entry when full."""
+    _speech_cache[key] = audio
+    _speech_cache.move_to_end(key)
+    if len(_speech_cache) > SPEECH_CACHE_SIZE:
+        _speech_cache.popitem(last=False)
+
+# Chunks of speech audio that may wait for the writer thread at once
+WRITE_QUEUE_SIZE = 64
+
+def write_chunks_in_background(chunks, file_path):
+    """
+    Write chunks of data to a file from a background thread as they arrive.
+    
+    Disk writes overlap with receiving the next chunks, and the function
+    returns once the file is complete.
+    
+    Args:
+        chunks (iterable): The chunks of bytes to write
+        file_path (Path): The file to write them to
+    
+    Returns:
+        bytes: All of the data that was written
+    
+    Raises:
+        OSError: If the file could not be written
+    """
+    chunk_queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+    errors = []
+    
+    def drain():
+        try:
+            with open(file_path, "wb") as f:
+                while (chunk := chunk_queue.get()) is not None:
+                    f.write(chunk)
+        except BaseException as e:
+            errors.append(e)
+            # Keep consuming so the producer never blocks on a full queue
+            while chunk_queue.get() is not None:
+                pass
+    
+    writer = threading.Thread(target=drain, daemon=True)
+    writer.start()
+    
+    received = []
+    try:
+        for chunk in chunks:
+            if errors:
+                break
+            received.append(chunk)
+            chunk_queue.put(chunk)
+    finally:
+        # Signal the end of the data and wait for the file to be complete
+        chunk_queue.put(None)
+        writer.join()
+    
+    if errors:
+        raise errors[0]
+    
+    return b''.join(received)
+
+def text_to_speech(text, voice="coral", instructions=None, output_file="speech.mp3", client=None):
     """
     Convert text to speech using OpenAI's API and save it to a file.
     
@@ -85,55 +351,170 @@ def text_to_speech(text, voice="coral", instructions=None, output_file="speech.m
         voice (str): The voice to use (default: "coral")
         instructions (str, optional): Additional instructions for the speech generation
         output_file (str): The name of the output file (default: "speech.mp3")
+        client (OpenAI, optional): The client to use (default: CLIENT)
     
     Returns:
         Path: The path to the generated speech file
     """
-    client = initialize_openai_client()
     speech_file_path = get_speech_file_path(output_file)
+    key = speech_cache_key(text, voice, instructions)
+    
+    audio = get_cached_speech(key)
+    if audio is None:
+        client = client or CLIENT
+        with client.audio.speech.with_streaming_response.create(
+            model=TTS_MODEL,
+            voice=voice,
+            input=text,
+            instructions=instructions if instructions is not None else NOT_GIVEN,
+        ) as response:
+            audio = write_chunks_in_background(response.iter_bytes(), speech_file_path)
+        cache_speech(key, audio)
+    else:
+        speech_file_path.write_bytes(audio)
     
-    with client.audio.speech.with_streaming_response.create(
-        model="gpt-4o-mini-tts",
-        voice=voice,
-        input=text,
-    ) as response:
-        response.stream_to_file(speech_file_path)
+    return speech_file_path
+
+async def synthesize_speech_async(text, voice="coral", instructions=None, client=None):
+    """
+    Convert text to speech using OpenAI's async API.
+    
+    Args:
+        text (str): The text to convert to speech
+        voice (str): The voice to use (default: "coral")
+        instructions (str, optional): Additional instructions for the speech generation
+        client (AsyncOpenAI, optional): The client to use (default: ASYNC_CLIENT)
+    
+    Returns:
+        bytes: The generated MP3 audio
+    """
+    key = speech_cache_key(text, voice, instructions)
+    
+    audio = get_cached_speech(key)
+    if audio is None:
+        client = client or ASYNC_CLIENT
+        async with client.audio.speech.with_streaming_response.create(
+            model=TTS_MODEL,
+            voice=voice,
+            input=text,
+            instructions=instructions if instructions is not None else NOT_GIVEN,
+        ) as response:
+            audio = await response.read()
+        cache_speech(key, audio)
+    
+    return audio
+
+async def cancel_tasks(tasks):
+    """Cancel tasks and wait for them, so their errors are not reported as never retrieved."""
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+async def write_speech_file_async(audio_tasks, output_file="speech.mp3"):
+    """
+    Wait for a sequence of speech tasks and write their audio, in order, to one file.
+    
+    Args:
+        audio_tasks (list): Tasks that each produce the MP3 bytes of one sentence
+        output_file (str): The name of the output file (default: "speech.mp3")
+    
+    Returns:
+        Path: The path to the generated speech file
+    """
+    speech_file_path = get_speech_file_path(output_file)
+    try:
+        audio_chunks = await asyncio.gather(*audio_tasks)
+    except BaseException:
+        # Don't keep paying for the other sentences once one has failed
+        await cancel_tasks(audio_tasks)
+        raise
+    
+    # MP3 frames are self-contained, so the sentences can simply be concatenated.
+    # The write runs in a worker thread so the event loop is never blocked on disk.
+    await asyncio.to_thread(speech_file_path.write_bytes, b''.join(audio_chunks))
     
     return speech_file_path
 
-def speech_to_text(audio_file_path, model="gpt-4o-transcribe"):
+def speech_to_text(audio, model="gpt-4o-transcribe", client=None):
     """
-    Convert speech from an audio file to text using OpenAI's API.
+    Convert speech to text using OpenAI's API.
     
     Args:
-        audio_file_path (str): Path to the audio file to transcribe
+        audio (str | bytes): Path to the audio file to transcribe, or the
+            contents of a WAV file already in memory
         model (str): The model to use for transcription (default: "gpt-4o-transcribe")
+        client (OpenAI, optional): The client to use (default: CLIENT)
     
     Returns:
         str: The transcribed text
     """
-    client = initialize_openai_client()
+    client = client or CLIENT
     
-    with open(audio_file_path, "rb") as audio_file:
+    if isinstance(audio, (bytes, bytearray)):
         transcription = client.audio.transcriptions.create(
             model=model,
-            file=audio_file
+            file=("input.wav", audio, "audio/wav")
         )
+    else:
+        with open(audio, "rb") as audio_file:
+            transcription = client.audio.transcriptions.create(
+                model=model,
+                file=audio_file
+            )
     
     return transcription.text
 
-def chat_completion(messages, model="gpt-4o"):
+async def speech_to_text_async(audio, model="gpt-4o-transcribe", client=None):
+    """
+    Async version of speech_to_text for in-memory WAV audio.
+    
+    The transcription is streamed so the text is returned as soon as the
+    final transcript event arrives.
+    
+    Args:
+        audio (bytes): The contents of a WAV file
+        model (str): The model to use for transcription (default: "gpt-4o-transcribe")
+        client (AsyncOpenAI, optional): The client to use (default: ASYNC_CLIENT)
+    
+    Returns:
+        str: The transcribed text
+    """
+    client = client or ASYNC_CLIENT
+    
+    stream = await client.audio.transcriptions.create(
+        model=model,
+        file=("input.wav", audio, "audio/wav"),
+        stream=True
+    )
+    
+    # Closing the stream on exit returns its connection to the pool early
+    text_parts = []
+    async with stream:
+        async for event in stream:
+            if event.type == "transcript.text.delta":
+                text_parts.append(event.delta)
+            elif event.type == "transcript.text.done":
+                return event.text
+    
+    return "".join(text_parts)
+
+# Voice replies are short, so the faster model keeps the turn latency down.
+# Pass model="gpt-4o" for answers that need the larger model.
+CHAT_MODEL = "gpt-4o-mini"
+
+def chat_completion(messages, model=CHAT_MODEL, client=None):
     """
     Get a chat completion from OpenAI's API.
     
     Args:
         messages (list): List of message dictionaries with 'role' and 'content'
-        model (str): The model to use (default: "gpt-4o")
+        model (str): The model to use (default: CHAT_MODEL)
+        client (OpenAI, optional): The client to use (default: CLIENT)
     
     Returns:
         str: The content of the assistant's response
     """
-    client = initialize_openai_client()
+    client = client or CLIENT
     
     completion = client.chat.completions.create(
         model=model,
@@ -142,35 +523,352 @@ def chat_completion(messages, model="gpt-4o"):
     
     return completion.choices[0].message.content
 
-def ask_and_speak(question, system_prompt="You are a helpful assistant.", voice="coral"):
+async def chat_completion_async(messages, model=CHAT_MODEL, client=None):
     """
-    Ask a question to the AI and convert its response to speech.
+    Async version of chat_completion.
     
     Args:
-        question (str): The question to ask
+        messages (list): List of message dictionaries with 'role' and 'content'
+        model (str): The model to use (default: CHAT_MODEL)
+        client (AsyncOpenAI, optional): The client to use (default: ASYNC_CLIENT)
+    
+    Returns:
+        str: The content of the assistant's response
+    """
+    client = client or ASYNC_CLIENT
+    
+    completion = await client.chat.completions.create(
+        model=model,
+        messages=messages
+    )
+    
+    return completion.choices[0].message.content
+
+class RateLimiter:
+    """
+    Token bucket that spaces out requests to stay under a requests-per-minute limit.
+    
+    Args:
+        requests_per_minute (float): Sustained request rate to allow
+        burst (int): Number of requests that may be sent back to back (default: 1)
+    """
+    
+    def __init__(self, requests_per_minute, burst=1):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait until a request may be sent and take a token for it."""
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+async def batch_chat_completion(prompts, system_prompt="You are a helpful assistant.",
+                                model=CHAT_MODEL, max_concurrency=8, requests_per_minute=500,
+                                client=None):
+    """
+    Get chat completions for many independent prompts concurrently.
+    
+    If any prompt fails, the requests still pending are cancelled and the
+    first error is raised, so a failed batch stops spending API calls.
+    
+    Args:
+        prompts (list): The user prompts to answer
         system_prompt (str): The system prompt for the AI (default: "You are a helpful assistant.")
-        voice (str): The voice to use for speech (default: "coral")
+        model (str): The model to use (default: CHAT_MODEL)
+        max_concurrency (int): Maximum number of requests in flight (default: 8)
+        requests_per_minute (float): Request rate limit to respect (default: 500)
+        client (AsyncOpenAI, optional): The client to use (default: ASYNC_CLIENT)
+    
+    Returns:
+        list: The assistant's responses, in the same order as the prompts
+    
+    Raises:
+        Exception: The first error raised by any of the requests
+    """
+    client = client or ASYNC_CLIENT
+    semaphore = asyncio.Semaphore(max_concurrency)
+    rate_limiter = RateLimiter(requests_per_minute, burst=max_concurrency)
+    
+    async def answer(prompt):
+        async with semaphore:
+            await rate_limiter.acquire()
+            return await chat_completion_async([
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ], model=model, client=client)
+    
+    tasks = [asyncio.create_task(answer(prompt)) for prompt in prompts]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        await cancel_tasks(tasks)
+        raise
+
+async def chat_completion_stream(messages, model=CHAT_MODEL, client=None):
+    """
+    Stream a chat completion from OpenAI's API.
+    
+    Args:
+        messages (list): List of message dictionaries with 'role' and 'content'
+        model (str): The model to use (default: CHAT_MODEL)
+        client (AsyncOpenAI, optional): The client to use (default: ASYNC_CLIENT)
+    
+    Yields:
+        str: Pieces of the assistant's response as they arrive
+    """
+    client = client or ASYNC_CLIENT
+    
+    stream = await client.chat.completions.create(
+        model=model,
+        messages=messages,
+        stream=True
+    )
+    
+    # Closing the stream on exit returns its connection to the pool, even if
+    # the caller stops reading early
+    async with stream:
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+def split_sentences(text):
+    """
+    Split off the complete sentences at the start of a piece of text.
+    
+    Args:
+        text (str): Text that may end with an unfinished sentence
+    
+    Returns:
+        tuple: (sentences, remainder) where remainder is the unfinished tail
+    """
+    parts = SENTENCE_END.split(text)
+    return parts[:-1], parts[-1]
+
+def estimate_tokens(messages):
+    """Roughly estimate the number of tokens in a list of messages."""
+    # About four characters per token for English text
+    return sum(len(message["content"]) for message in messages) // 4
+
+def build_messages(system_prompt, history, question):
+    """
+    Build the messages for a chat request.
+    
+    The system prompt always comes first and the history is only ever
+    appended to, so consecutive requests share a long identical prefix that
+    the API can serve from its prompt cache.
+    
+    Args:
+        system_prompt (str): The system prompt for the AI
+        history (iterable): Earlier user and assistant messages of the conversation
+        question (str): The new user message
     
     Returns:
-        tuple: (response_text, speech_file_path)
+        list: The messages to send
     """
-    messages = [
+    return [
         {"role": "system", "content": system_prompt},
+        *history,
         {"role": "user", "content": question}
     ]
+
+def new_history(max_turns=HISTORY_MAX_TURNS):
+    """Return an empty conversation history that holds at most max_turns exchanges."""
+    return deque(maxlen=2 * max_turns)
+
+async def compact_history(history, max_tokens=HISTORY_TOKEN_BUDGET, keep_messages=HISTORY_KEEP_MESSAGES,
+                          client=None):
+    """
+    Summarize older turns once the conversation history grows too long.
     
-    # Get the AI's response
-    response = chat_completion(messages)
+    Everything except the most recent messages is replaced, in place, by a
+    single summary note at the start of the history. This happens before the
+    bounded history would start dropping messages on its own, and between
+    compactions the history is only appended to, which keeps the prompt
+    prefix stable for caching.
+    
+    Args:
+        history (deque): Earlier user and assistant messages, as made by new_history
+        max_tokens (int): Estimated history size that triggers a summary
+        keep_messages (int): Number of recent messages to keep verbatim
+        client (AsyncOpenAI, optional): The client to use for the summary (default: ASYNC_CLIENT)
+    """
+    # Each turn adds a user and an assistant message
+    nearly_full = len(history) + 2 > history.maxlen
+    if len(history) <= keep_messages or not (nearly_full or estimate_tokens(history) > max_tokens):
+        return
+    
+    client = client or ASYNC_CLIENT
+    older = list(history)[:-keep_messages]
+    transcript = "\n".join(f"{message['role']}: {message['content']}" for message in older)
+    summary = await chat_completion_async([
+        {"role": "system", "content": "Summarize this conversation in a few sentences, "
+                                      "keeping any facts the assistant may need later."},
+        {"role": "user", "content": transcript}
+    ], client=client)
+    
+    for _ in older:
+        history.popleft()
+    history.appendleft({"role": "assistant", "content": f"Summary of the conversation so far: {summary}"})
+
+async def ask_and_speak(question, system_prompt="You are a helpful assistant.", voice="coral",
+                        history=None, model=CHAT_MODEL, client=None):
+    """
+    Ask a question to the AI and start converting its response to speech.
+    
+    The response is streamed and each sentence is sent to text-to-speech as
+    soon as it is complete, so the audio for the first sentence is being
+    generated while the rest of the response is still arriving.
+    
+    Args:
+        question (str): The question to ask
+        system_prompt (str): The system prompt for the AI (default: "You are a helpful assistant.")
+        voice (str): The voice to use for speech (default: "coral")
+        history (iterable, optional): Earlier user and assistant messages of the conversation
+        model (str): The chat model to use (default: CHAT_MODEL)
+        client (AsyncOpenAI, optional): The client to use for both the chat and
+            the speech requests (default: ASYNC_CLIENT)
+    
+    Returns:
+        tuple: (response_text, speech_task) where awaiting speech_task
+            gives the path to the speech file, or speech_task is None if
+            the response had nothing to speak
+    """
+    client = client or ASYNC_CLIENT
+    messages = build_messages(system_prompt, history or [], question)
+    
+    instructions = "Speak in a natural and conversational tone."
+    
+    def speak(sentence):
+        return asyncio.create_task(synthesize_speech_async(
+            text=sentence,
+            voice=voice,
+            instructions=instructions,
+            client=client
+        ))
+    
+    # Stream the AI's response, converting each finished sentence to speech
+    response_parts = []
+    audio_tasks = []
+    pending = ""
+    try:
+        # aclosing shuts the stream down right away if this loop exits early
+        async with aclosing(chat_completion_stream(messages, model=model, client=client)) as deltas:
+            async for delta in deltas:
+                response_parts.append(delta)
+                sentences, pending = split_sentences(pending + delta)
+                audio_tasks.extend(speak(sentence) for sentence in sentences)
+    except BaseException:
+        # The response is incomplete, so stop generating speech for it
+        await cancel_tasks(audio_tasks)
+        raise
+    
+    if pending.strip():
+        audio_tasks.append(speak(pending))
+    
+    response = "".join(response_parts)
     print(f"AI Response: {response}")
     
-    # Convert the response to speech
-    speech_file = text_to_speech(
-        text=response,
-        voice=voice,
-        instructions="Speak in a natural and conversational tone."
-    )
+    if not audio_tasks:
+        return response, None
     
-    return response, speech_file
+    # Combine the sentence audio into one file in the background
+    speech_task = asyncio.create_task(write_speech_file_async(audio_tasks))
+    
+    return response, speech_task
+
+# Input read from a non-interactive stdin that is not yet part of a returned line
+_stdin_buffer = bytearray()
+
+async def read_stdin_line():
+    """
+    Read one line from a non-interactive stdin through the event loop.
+    
+    Pipes are watched with loop.add_reader, so nothing is left blocked on
+    stdin if the loop is cancelled. Regular files, and loops that cannot watch
+    pipes (such as the Windows proactor loop), fall back to a plain read.
+    
+    Returns:
+        str: The line read, without its line ending
+    
+    Raises:
+        EOFError: If stdin is exhausted
+    """
+    loop = asyncio.get_running_loop()
+    fd = sys.stdin.fileno()
+    
+    while b"\n" not in _stdin_buffer:
+        readable = loop.create_future()
+        try:
+            loop.add_reader(fd, lambda: readable.done() or readable.set_result(None))
+        except (NotImplementedError, OSError):
+            pass
+        else:
+            try:
+                await readable
+            finally:
+                loop.remove_reader(fd)
+        
+        data = os.read(fd, 4096)
+        if not data:
+            if not _stdin_buffer:
+                raise EOFError("EOF when reading a line")
+            break
+        _stdin_buffer.extend(data)
+    
+    line, _, rest = bytes(_stdin_buffer).partition(b"\n")
+    _stdin_buffer[:] = rest
+    return line.decode(sys.stdin.encoding or "utf-8", errors="replace").rstrip("\r")
+
+async def async_input(prompt=""):
+    """
+    Read a line from the user without blocking the event loop.
+    
+    On a terminal the read happens in a daemon thread, so background tasks
+    keep running while the user types and Ctrl+C can still exit without
+    waiting for input. A daemon thread blocked on a piped stdin would hold
+    the stdin lock and abort the interpreter at shutdown, so non-interactive
+    input is read through the event loop with read_stdin_line instead.
+    
+    Args:
+        prompt (str): The prompt to show
+    
+    Returns:
+        str: The line the user entered
+    """
+    if not sys.stdin.isatty():
+        print(prompt, end="", flush=True)
+        return await read_stdin_line()
+    
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def deliver(setter, value):
+        if not future.done():
+            setter(value)
+    
+    def read():
+        try:
+            result = (future.set_result, input(prompt))
+        except BaseException as e:
+            result = (future.set_exception, e)
+        try:
+            loop.call_soon_threadsafe(deliver, *result)
+        except RuntimeError:
+            # The event loop has already been closed
+            pass
+    
+    threading.Thread(target=read, daemon=True).start()
+    return await future
 
 def play_audio(file_path):
     """
@@ -189,20 +887,25 @@ def play_audio(file_path):
     
     pygame.mixer.quit()
 
-def main():
+async def main():
     """Interactive voice conversation loop."""
     print("Welcome to the Voice Assistant!")
     print("Press 'Q' to quit at any time.")
-    print("Press 'R' to start recording (5 seconds)")
+    print("Press 'R' to start recording (stops when you stop speaking)")
+    
+    # Warm up connections in the background while the user gets ready
+    warm_up_task = asyncio.create_task(warm_up_connection_async())
+    last_turn_time = time.monotonic()
     
     # Initialize conversation history
-    conversation_history = []
+    conversation_history = new_history()
+    compaction_task = None
     system_prompt = "You are a helpful and friendly assistant. Keep your responses concise and natural."
     
     try:
         while True:
             # Check if user wants to quit
-            user_input = input("\nPress 'R' to record or 'Q' to quit: ").strip().upper()
+            user_input = (await async_input("\nPress 'R' to record or 'Q' to quit: ")).strip().upper()
             if user_input == 'Q':
                 print("Goodbye!")
                 break
@@ -212,32 +915,59 @@ def main():
             try:
                 # Record audio
                 print("\nStarting recording...")
-                audio_path = record_audio()
+                audio = await asyncio.to_thread(capture_audio)
+                if audio is None:
+                    print("No speech detected.")
+                    continue
                 
-                # Transcribe the audio
+                # Transcribe the audio. If the user was away long enough for the pooled
+                # connections to expire, reconnect for the response at the same time.
                 print("Transcribing audio...")
-                question = speech_to_text(audio_path)
+                if time.monotonic() - last_turn_time > HTTP_LIMITS.keepalive_expiry:
+                    question, _ = await asyncio.gather(
+                        speech_to_text_async(audio),
+                        warm_up_connection_async()
+                    )
+                else:
+                    question = await speech_to_text_async(audio)
+                last_turn_time = time.monotonic()
                 print(f"You said: {question}")
                 
-                # Add to conversation history
-                conversation_history.append({"role": "user", "content": question})
+                # The history must be fully compacted before it is sent again
+                if compaction_task is not None:
+                    try:
+                        await compaction_task
+                    except Exception as e:
+                        print(f"Could not summarize the conversation: {str(e)}")
+                    compaction_task = None
                 
                 # Get AI response and convert to speech
                 print("Getting AI response...")
-                response, speech_file = ask_and_speak(
+                response, speech_task = await ask_and_speak(
                     question=question,
                     system_prompt=system_prompt,
-                    voice="coral"
+                    voice="coral",
+                    history=conversation_history
                 )
                 
-                # Add AI response to conversation history
+                # Add the exchange to conversation history
+                conversation_history.append({"role": "user", "content": question})
                 conversation_history.append({"role": "assistant", "content": response})
                 
+                # Summarize old turns in the background, independently of playback
+                compaction_task = asyncio.create_task(compact_history(conversation_history))
+                
+                if speech_task is None:
+                    print("The AI response was empty, nothing to play.")
+                    continue
+                
+                # Wait for the speech to be ready only when it is needed
+                speech_file = await speech_task
                 print(f"\nResponse saved to: {speech_file}")
                 print("Playing response...")
                 
                 # Play the audio response
-                play_audio(str(speech_file))
+                await asyncio.to_thread(play_audio, str(speech_file))
                 
             except Exception as e:
                 print(f"An error occurred: {str(e)}")
@@ -247,6 +977,13 @@ def main():
         print("\nGoodbye!")
     except Exception as e:
         print(f"An unexpected error occurred: {str(e)}")
+    finally:
+        # Don't leave background work running when the conversation ends
+        await cancel_tasks([task for task in (warm_up_task, compaction_task) if task is not None])
 
 if __name__ == "__main__":
-    main()
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        # Raised here when Ctrl+C arrives while the loop is awaiting
+        print("\nGoodbye!")